@@ -1,8 +1,18 @@
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 import sqlite3
 import requests
 import re
 import os
+import signal
+import sys
+import threading
+from collections import defaultdict
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from sqlalchemy import create_engine, text
 from dotenv import load_dotenv
 
@@ -15,33 +25,103 @@ MOVIES_CSV = os.getenv('MOVIES_CSV')
 RATINGS_CSV = os.getenv('RATINGS_CSV')
 OMDB_API_KEY = os.getenv('OMDB_API_KEY')
 OMDB_URL = os.getenv('OMDB_URL')
-CACHE_FILE = os.getenv('CACHE_FILE')
+CACHE_FILE = os.getenv('CACHE_FILE', 'omdb_cache.parquet')
+LEGACY_CACHE_FILE = os.path.splitext(CACHE_FILE)[0] + '.csv'  # Pre-Parquet cache, migrated on first run
 API_LIMIT = int(os.getenv('API_LIMIT', 1000))  # Ensure integer type
+MAX_WORKERS = int(os.getenv('MAX_WORKERS', 16))  # Concurrent OMDb requests
+CACHE_CHECKPOINT_EVERY = int(os.getenv('CACHE_CHECKPOINT_EVERY', 50))  # Flush cache every N API responses
+
+# --- Typed CSV schemas (skip dtype inference and parse in pyarrow's multithreaded C++ reader) ---
+MOVIES_CSV_SCHEMA = pa.schema([
+    ('movieId', pa.int64()),
+    ('title', pa.string()),
+    ('genres', pa.dictionary(pa.int32(), pa.string()))  # Few distinct values -> pandas category
+])
+RATINGS_CSV_SCHEMA = pa.schema([
+    ('userId', pa.int32()),
+    ('movieId', pa.int32()),
+    ('rating', pa.float32()),
+    ('timestamp', pa.int64())
+])
+
+# --- SQLite settings for bulk ingest (applied on the loading connection) ---
+SQLITE_BULK_PRAGMAS = [
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA cache_size=-200000',  # ~200 MB page cache
+    'PRAGMA locking_mode=EXCLUSIVE'
+]
+SQLITE_MAX_VARIABLES = 999  # Bound parameters per statement (conservative SQLite default)
+RATING_SCALE = 2  # Ratings are stored as integer half-stars (4.5 -> 9); queries divide by 2.0
+DB_SCHEMA_VERSION = 1  # PRAGMA user_version; 1 = ratings stored scaled by RATING_SCALE
+
+# --- OMDb cache schema (fixed dtypes keep Parquet writes consistent across runs;
+#     repetitive strings are stored as category codes) ---
+CACHE_SCHEMA = {
+    'movieId': 'int64',
+    'title': 'object',
+    'release_year': 'Int64',
+    'status': 'category',
+    'imdb_id': 'object',
+    'director': 'category',
+    'plot': 'object',
+    'box_office': 'object',
+    'poster_url': 'object',
+    'runtime_minutes': 'object',
+    'metascore': 'float64',
+    'imdb_rating': 'float64'
+}
+
+# --- Shared HTTP session (keep-alive + connection pool for the worker threads) ---
+OMDB_ENDPOINT = 'http://www.omdbapi.com/'
+
+SESSION = requests.Session()
+SESSION.headers['Connection'] = 'keep-alive'
+for _scheme in ('http://', 'https://'):
+    SESSION.mount(_scheme, HTTPAdapter(
+        pool_connections=MAX_WORKERS,
+        pool_maxsize=MAX_WORKERS,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+    ))
 
 # -------------------------------------------------------------
 #                  UTILITY FUNCTIONS
 # -------------------------------------------------------------
 
-def extract_year(title):
-    """Extract the 4-digit year at the end of a movie title like 'Toy Story (1995)'."""
-    match = re.search(r'\((\d{4})\)$', str(title))
-    return int(match.group(1)) if match else None
+# Trailing '(YYYY)' year in MovieLens titles, compiled once for both the vectorized and per-call paths
+_YEAR_RE = re.compile(r'\((\d{4})\)\s*$')
+_TITLE_YEAR_STRIP = re.compile(r'\s*\(\d{4}\)\s*$')
+
+# Per-(title, year) locks so concurrent workers never issue the same request twice
+_OMDB_KEY_LOCKS = defaultdict(threading.Lock)
+_OMDB_KEY_LOCKS_GUARD = threading.Lock()
 
 
 def fetch_omdb_data(title, year):
-    """Fetch movie details from OMDb API using title and year."""
-    clean_title = re.sub(r'\s*\(\d{4}\)\s*$', '', str(title)).strip()
+    """Fetch movie details from OMDb API using title and year (memoized per run)."""
+    clean_title = _TITLE_YEAR_STRIP.sub('', str(title)).strip()
+    year = int(year) if pd.notna(year) else None  # lru_cache needs hashable keys (no NaN/NA)
+
+    with _OMDB_KEY_LOCKS_GUARD:
+        key_lock = _OMDB_KEY_LOCKS[(clean_title, year)]
+    with key_lock:
+        return _fetch_omdb_cached(clean_title, year)
 
+
+@lru_cache(maxsize=None)
+def _fetch_omdb_cached(clean_title, year):
+    """Issue the OMDb request for an already-cleaned title; duplicate keys hit the cache."""
     params = {
         't': clean_title,
-        'y': int(year) if pd.notna(year) else '',
+        'y': year if year is not None else '',
         'plot': 'short',
         'r': 'json',
         'apikey': OMDB_API_KEY
     }
 
     try:
-        response = requests.get('http://www.omdbapi.com/', params=params, timeout=5)
+        response = SESSION.get(OMDB_ENDPOINT, params=params, timeout=5)
         response.raise_for_status()
         data = response.json()
 
@@ -65,6 +145,64 @@ def fetch_omdb_data(title, year):
         return None
 
 
+def combine_cache(df_cache, records):
+    """Append newly fetched OMDb records to the cache frame with a single concat."""
+    df_new = pd.DataFrame(records)
+    return pd.concat([df_cache, df_new], ignore_index=True) if len(df_cache) else df_new
+
+
+def write_cache(df_cache):
+    """Normalize the cache to CACHE_SCHEMA and write it atomically (temp file + os.replace)."""
+    df_cache = df_cache.reindex(columns=list(CACHE_SCHEMA)).astype(CACHE_SCHEMA)
+    tmp_file = CACHE_FILE + '.part'
+    df_cache.to_parquet(tmp_file, index=False, compression='zstd')
+    os.replace(tmp_file, CACHE_FILE)
+    return df_cache
+
+
+def read_csv_typed(path, schema):
+    """Read a memory-mapped CSV with pyarrow using explicit column types and hand it to pandas."""
+    with pa.memory_map(path, 'r') as source:
+        table = pacsv.read_csv(
+            source,
+            read_options=pacsv.ReadOptions(block_size=64 << 20, use_threads=True),
+            convert_options=pacsv.ConvertOptions(column_types=schema)
+        )
+    return table.to_pandas(self_destruct=True, split_blocks=True)
+
+
+def sqlite_chunksize(df):
+    """Rows per multi-row INSERT so one statement stays under SQLite's bound-parameter limit."""
+    return max(1, SQLITE_MAX_VARIABLES // max(1, len(df.columns)))
+
+
+def drop_secondary_indexes(table, conn):
+    """Drop the explicitly created indexes on `table` and return their CREATE statements for rebuilding."""
+    # Automatic PRIMARY KEY / UNIQUE indexes have no SQL in sqlite_master and stay in place
+    indexes = conn.exec_driver_sql(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+        (table,)
+    ).fetchall()
+    for name, _ in indexes:
+        conn.exec_driver_sql(f'DROP INDEX "{name}"')
+    return [sql for _, sql in indexes]
+
+
+def upsert_table(df, table, key_col, conn):
+    """Replace the rows of `table` whose key appears in `df`, leaving every other row untouched."""
+    staging_table = f'{table}_staging'
+    cols = ', '.join(df.columns)
+
+    df.to_sql(
+        staging_table, conn, if_exists='replace', index=False,
+        method='multi', chunksize=sqlite_chunksize(df)
+    )
+    conn.exec_driver_sql(f'DELETE FROM {table} WHERE {key_col} IN (SELECT {key_col} FROM {staging_table})')
+    # OR IGNORE: a row whose UNIQUE value (e.g. imdb_id) already belongs to another stored row is skipped
+    conn.exec_driver_sql(f'INSERT OR IGNORE INTO {table} ({cols}) SELECT {cols} FROM {staging_table}')
+    conn.exec_driver_sql(f'DROP TABLE {staging_table}')
+
+
 # -------------------------------------------------------------
 #                     MAIN ETL PIPELINE
 # -------------------------------------------------------------
@@ -75,145 +213,233 @@ def etl_pipeline():
 
     # ------------------ 1️⃣ Extraction ------------------
     print("1. Extracting data from CSV files...")
-    df_movies = pd.read_csv(MOVIES_CSV)
-    df_ratings = pd.read_csv(RATINGS_CSV)
+    df_movies = read_csv_typed(MOVIES_CSV, MOVIES_CSV_SCHEMA)
+    df_ratings = read_csv_typed(RATINGS_CSV, RATINGS_CSV_SCHEMA)
 
     # ------------------ 2️⃣ Transformation + Enrichment ------------------
     print("2. Transforming and Enriching Movie data...")
 
-    df_movies['release_year'] = df_movies['title'].apply(extract_year)
-    df_movies['title_cleaned'] = df_movies.apply(
-        lambda row: row['title'].replace(f" ({row['release_year']})", "") if row['release_year'] else row['title'],
-        axis=1
-    )
+    # Vectorized: extract the trailing 4-digit year, e.g. 'Toy Story (1995)' -> 1995, and strip it from the title
+    df_movies['release_year'] = df_movies['title'].str.extract(_YEAR_RE, expand=False).astype('Int64')
+    df_movies['title_cleaned'] = df_movies['title'].str.replace(_TITLE_YEAR_STRIP, '', regex=True).str.strip()
 
     # Load cache
     if os.path.exists(CACHE_FILE):
-        df_cache = pd.read_csv(CACHE_FILE)
+        df_cache = pd.read_parquet(CACHE_FILE)
         print(f"  > Loaded {len(df_cache)} cached OMDb records.")
+    elif os.path.exists(LEGACY_CACHE_FILE):
+        # reindex: older caches may predate some columns (e.g. imdb_rating); missing ones become empty
+        df_cache = pd.read_csv(LEGACY_CACHE_FILE).reindex(columns=list(CACHE_SCHEMA)).astype(CACHE_SCHEMA)
+        print(f"  > Loaded {len(df_cache)} cached OMDb records from legacy CSV cache ({LEGACY_CACHE_FILE}).")
     else:
-        df_cache = pd.DataFrame(columns=[
-            'movieId', 'title', 'release_year', 'status', 'imdb_id',
-            'director', 'plot', 'box_office', 'poster_url',
-            'runtime_minutes', 'metascore', 'imdb_rating'  # ✅ Added imdb_rating
-        ])
+        df_cache = pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in CACHE_SCHEMA.items()})
         print("  > No existing cache found. Starting fresh.")
 
-    processed_ids = set(df_cache['movieId'])
-    movies_to_enrich = df_movies[df_movies['release_year'].notna()]
-    movies_to_enrich = movies_to_enrich[~movies_to_enrich['movieId'].isin(processed_ids)]
+    # Integer Index set difference stays in NumPy (no Python set of boxed ids)
+    to_fetch_ids = pd.Index(df_movies.loc[df_movies['release_year'].notna(), 'movieId']).difference(
+        pd.Index(df_cache['movieId']), sort=False
+    )
+    movies_to_enrich = df_movies.set_index('movieId').loc[to_fetch_ids].reset_index()
     total_new = len(movies_to_enrich)
     print(f"  > {total_new} movies to fetch from OMDb (not in cache).")
 
     omdb_data_list = []
     failed_data_list = []
-    processed_count = 0
-
-    for index, row in movies_to_enrich.iterrows():
-        if processed_count >= API_LIMIT:
-            print(f"\n Reached daily API limit ({API_LIMIT}). Stopping enrichment for today.\n")
-            break
-
-        if processed_count % 100 == 0:
-            print(f"  > Processing movie {processed_count + 1}/{min(total_new, API_LIMIT)}...")
-
-        omdb_result = fetch_omdb_data(row['title_cleaned'], row['release_year'])
-        processed_count += 1
-
-        if omdb_result:
-            omdb_data_list.append({
-                **omdb_result,
-                'movieId': row['movieId'],
-                'title': row['title_cleaned'],
-                'release_year': row['release_year'],
-                'status': 'success'
-            })
-        else:
-            failed_data_list.append({
-                'movieId': row['movieId'],
-                'title': row['title_cleaned'],
-                'release_year': row['release_year'],
-                'status': 'failed'
-            })
 
-    # Update cache (skip empty frames)
-    if omdb_data_list or failed_data_list:
-        df_new_success = pd.DataFrame(omdb_data_list)
-        df_new_failed = pd.DataFrame(failed_data_list)
-        df_new_combined = pd.concat([df_new_success, df_new_failed], ignore_index=True)
-
-        frames_to_concat = [df for df in [df_cache, df_new_combined] if not df.empty]
-        df_cache = pd.concat(frames_to_concat, ignore_index=True) if frames_to_concat else df_cache
-
-        df_cache.to_csv(CACHE_FILE, index=False)
-        print(f"  > Cache updated with {len(df_new_combined)} new records (total: {len(df_cache)}).")
+    if total_new > API_LIMIT:
+        print(f"\n Reached daily API limit ({API_LIMIT}). Only the first {API_LIMIT} movies will be enriched today.\n")
+
+    # Enforce the daily API limit before submitting anything to the pool
+    # Pull each column out as an array once and zip them (no per-row Series/namedtuple)
+    movies_batch = movies_to_enrich.head(API_LIMIT)
+    tasks = list(zip(
+        movies_batch['movieId'].to_numpy(),
+        movies_batch['title_cleaned'].to_numpy(),
+        movies_batch['release_year'].to_numpy()
+    ))
+    total_tasks = len(tasks)
+
+    def fetch_task(task):
+        movie_id, title, year = task
+        return movie_id, title, year, fetch_omdb_data(title, year)
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        try:
+            for processed_count, (movie_id, title, year, omdb_result) in enumerate(executor.map(fetch_task, tasks)):
+                if processed_count % 100 == 0:
+                    print(f"  > Processing movie {processed_count + 1}/{total_tasks}...")
+
+                if omdb_result:
+                    omdb_data_list.append({
+                        **omdb_result,
+                        'movieId': movie_id,
+                        'title': title,
+                        'release_year': year,
+                        'status': 'success'
+                    })
+                else:
+                    failed_data_list.append({
+                        'movieId': movie_id,
+                        'title': title,
+                        'release_year': year,
+                        'status': 'failed'
+                    })
+
+                # Checkpoint so a crash or kill never loses more than CACHE_CHECKPOINT_EVERY API calls
+                if (processed_count + 1) % CACHE_CHECKPOINT_EVERY == 0:
+                    write_cache(combine_cache(df_cache, omdb_data_list + failed_data_list))
+        except BaseException:
+            # Interrupted (Ctrl+C / SIGTERM / error): drop queued requests and keep what was already fetched
+            executor.shutdown(wait=False, cancel_futures=True)
+            if omdb_data_list or failed_data_list:
+                write_cache(combine_cache(df_cache, omdb_data_list + failed_data_list))
+                print(f"\n Enrichment interrupted. Saved {len(omdb_data_list) + len(failed_data_list)} new records to the cache.\n")
+            raise
+
+    # Update cache
+    new_records = omdb_data_list + failed_data_list
+    if new_records:
+        df_cache = write_cache(combine_cache(df_cache, new_records))
+        print(f"  > Cache updated with {len(new_records)} new records (total: {len(df_cache)}).")
 
     # Use only successfully enriched movies for DB insertion
     df_omdb_success = df_cache[df_cache['status'] == 'success'].drop_duplicates(subset=['movieId'])
-    df_movies_enriched = df_movies.merge(df_omdb_success, on='movieId', how='inner')
+    df_omdb_success = df_omdb_success.set_index('movieId')
 
-    # --- FIX: Normalize column names & drop duplicates ---
-    df_movies_enriched.rename(columns={'title_x': 'title', 'release_year_x': 'release_year'}, inplace=True)
-    if 'release_year_y' in df_movies_enriched.columns:
-        df_movies_enriched.drop(columns=['release_year_y'], inplace=True)
-
-    expected_cols = [
-        'movieId', 'title', 'release_year', 'imdb_id', 'director',
-        'plot', 'box_office', 'poster_url', 'runtime_minutes', 'metascore', 'imdb_rating'  # ✅ Added imdb_rating
+    # Align OMDb fields by movieId index lookup (one hashed map per column, no merge suffixes to clean up)
+    omdb_cols = [
+        'imdb_id', 'director', 'plot', 'box_office', 'poster_url',
+        'runtime_minutes', 'metascore', 'imdb_rating'
     ]
-    available_cols = [c for c in expected_cols if c in df_movies_enriched.columns]
-    df_movies_load = df_movies_enriched[available_cols].rename(columns={'movieId': 'movie_id'})
+    is_enriched = df_movies['movieId'].isin(df_omdb_success.index)
+    df_movies_enriched = df_movies.loc[is_enriched, ['movieId', 'title', 'release_year']].copy()
+    for col in omdb_cols:
+        df_movies_enriched[col] = df_movies_enriched['movieId'].map(df_omdb_success[col])
+
+    df_movies_enriched['director'] = df_movies_enriched['director'].astype(object)  # SQLite stores plain TEXT
+
+    df_movies_load = df_movies_enriched.rename(columns={'movieId': 'movie_id'})
+    # movies.imdb_id is UNIQUE: keep the first movie when OMDb resolves two titles to the same IMDb entry
+    df_movies_load = df_movies_load[~(df_movies_load['imdb_id'].duplicated() & df_movies_load['imdb_id'].notna())]
+
+    # Narrow numeric dtypes before the SQL write ('81 min' -> 81). imdb_rating stays float64:
+    # float32 would store values like 8.3 as 8.300000190734863 in SQLite REAL columns.
+    # Runtime and metascore come from the API unbounded (some runtimes exceed 32767 min), so use Int32.
+    df_movies_load = df_movies_load.astype({'movie_id': 'int32', 'release_year': 'Int16', 'metascore': 'Int32'})
+    df_movies_load['runtime_minutes'] = (
+        df_movies_load['runtime_minutes'].astype('string').str.extract(r'(\d+)', expand=False).astype('Int32')
+    )
 
     # ------------------ Genre processing ------------------
     print("  > Processing genres...")
-    all_genres = set()
-    for genres_str in df_movies['genres'].dropna():
-        for genre in genres_str.split('|'):
-            if genre and genre != '(no genres listed)':
-                all_genres.add(genre)
+    df_genre_pairs = df_movies[['movieId', 'genres']].dropna(subset=['genres'])
+    df_genre_pairs = df_genre_pairs[df_genre_pairs['genres'] != '(no genres listed)']
+    df_genre_pairs = df_genre_pairs.assign(genre_name=df_genre_pairs['genres'].str.split('|')).explode('genre_name')
+    df_genre_pairs = df_genre_pairs[df_genre_pairs['genre_name'].notna() & (df_genre_pairs['genre_name'] != '')]
 
-    df_genres = pd.DataFrame(sorted(list(all_genres)), columns=['genre_name'])
+    genre_names = sorted(df_genre_pairs['genre_name'].unique())
+    df_genres = pd.DataFrame({'genre_name': genre_names})
     df_genres['genre_id'] = df_genres.index + 1
 
-    movie_genre_mappings = []
-    genre_to_id = df_genres.set_index('genre_name')['genre_id'].to_dict()
-
-    for index, row in df_movies.iterrows():
-        if pd.notna(row['genres']) and row['genres'] != '(no genres listed)':
-            for genre in row['genres'].split('|'):
-                if genre in genre_to_id:
-                    movie_genre_mappings.append({'movie_id': row['movieId'], 'genre_id': genre_to_id[genre]})
-    df_movie_genres = pd.DataFrame(movie_genre_mappings)
+    # Categorical codes over the sorted genre names are exactly genre_id - 1, so the junction
+    # table is built straight from two typed arrays (no per-row dicts, no join)
+    genre_ids = pd.Categorical(df_genre_pairs['genre_name'], categories=genre_names).codes.astype('int32') + 1
+    df_movie_genres = pd.DataFrame({
+        'movie_id': df_genre_pairs['movieId'].to_numpy(),
+        'genre_id': genre_ids
+    })
 
     df_ratings_load = df_ratings[['userId', 'movieId', 'rating', 'timestamp']].rename(
         columns={'userId': 'user_id', 'movieId': 'movie_id'}
-    )
+    ).astype({'user_id': 'int32', 'movie_id': 'int32', 'timestamp': 'int64'})
+    # MovieLens ratings are multiples of 0.5 in [0.5, 5.0], so half-star counts fit in int8
+    df_ratings_load['rating'] = (df_ratings_load['rating'].to_numpy() * RATING_SCALE).round().astype('int8')
 
     # ------------------ 3️⃣ Loading into SQLite ------------------
     print("3. Loading data into SQLite database...")
 
     engine = create_engine(f'sqlite:///{DATABASE_NAME}')
 
-    with engine.connect() as conn:
-        print("  > Creating/Recreating Tables (Idempotency Step)...")
+    # Single connection + single transaction for the whole load (one commit/fsync instead of one per table)
+    with engine.begin() as conn:
+        # PRAGMAs must run before the first write opens the transaction
+        for pragma in SQLITE_BULK_PRAGMAS:
+            conn.exec_driver_sql(pragma)
+
+        print("  > Creating Tables if missing (Idempotency Step)...")
         with open('schema.sql', 'r') as f:
             sql_script = f.read()
 
-        for statement in sql_script.strip().split(';'):
-            if statement.strip():
-                conn.exec_driver_sql(statement + ';')
-
-    print("  > Loading Genres...")
-    df_genres.to_sql('genres', engine, if_exists='replace', index=False)
-
-    print("  > Loading Movies (only successfully enriched)...")
-    df_movies_load.to_sql('movies', engine, if_exists='replace', index=False)
-
-    print("  > Loading Movie Genres Junction Table...")
-    df_movie_genres.to_sql('movie_genres', engine, if_exists='replace', index=False)
-
-    print("  > Loading Ratings...")
-    df_ratings_load.to_sql('ratings', engine, if_exists='replace', index=False)
+        # One-time upgrade of databases that still store ratings as REAL stars: move the old table aside
+        # so schema.sql recreates ratings with INTEGER affinity, then copy the rescaled rows back
+        needs_upgrade = conn.exec_driver_sql('PRAGMA user_version').scalar() < DB_SCHEMA_VERSION
+        upgrade_ratings = needs_upgrade and conn.exec_driver_sql(
+            "SELECT EXISTS (SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'ratings')"
+        ).scalar()
+        if upgrade_ratings:
+            drop_secondary_indexes('ratings', conn)  # Index names must be free for schema.sql
+            conn.exec_driver_sql('ALTER TABLE ratings RENAME TO ratings_old')
+
+        # One sqlite3 executescript call parses the whole file (no fragile split on ';').
+        # Runs on the same DBAPI connection, before any write has opened the load transaction.
+        conn.connection.driver_connection.executescript(sql_script)
+
+        if upgrade_ratings:
+            conn.exec_driver_sql(
+                'INSERT INTO ratings (user_id, movie_id, rating, timestamp) '
+                f'SELECT user_id, movie_id, CAST(ROUND(rating * {RATING_SCALE}) AS INTEGER), timestamp FROM ratings_old'
+            )
+            conn.exec_driver_sql('DROP TABLE ratings_old')
+        if needs_upgrade:
+            conn.exec_driver_sql(f'PRAGMA user_version = {DB_SCHEMA_VERSION}')
+
+        # Genres and the junction table are re-derived from the full catalog every run, so they are
+        # refreshed in place (both are small); movies and ratings are loaded incrementally.
+        print("  > Loading Genres...")
+        conn.exec_driver_sql('DELETE FROM movie_genres')
+        conn.exec_driver_sql('DELETE FROM genres')
+        df_genres.to_sql(
+            'genres', conn, if_exists='append', index=False,
+            method='multi', chunksize=sqlite_chunksize(df_genres)
+        )
+
+        print("  > Loading Movies (only successfully enriched)...")
+        # Stage only enriched movies not stored yet (anti-join on movie_id). This also picks up movies
+        # cached by an earlier run that never reached the load (interrupted enrichment, failed load).
+        stored_ids = conn.exec_driver_sql('SELECT movie_id FROM movies').scalars().all()
+        df_movies_load = df_movies_load[~df_movies_load['movie_id'].isin(stored_ids)]
+        upsert_table(df_movies_load, 'movies', 'movie_id', conn)
+
+        print("  > Loading Movie Genres Junction Table...")
+        df_movie_genres.to_sql(
+            'movie_genres', conn, if_exists='append', index=False,
+            method='multi', chunksize=sqlite_chunksize(df_movie_genres)
+        )
+
+        print("  > Loading Ratings...")
+        # Ratings are append-only: insert only rows from the latest stored timestamp on. >= keeps new
+        # ratings sharing that second; re-inserted boundary rows are absorbed by INSERT OR REPLACE.
+        last_timestamp = conn.exec_driver_sql('SELECT MAX(timestamp) FROM ratings').scalar()
+        if last_timestamp is not None:
+            df_ratings_load = df_ratings_load[df_ratings_load['timestamp'] >= last_timestamp]
+            index_statements = []
+        else:
+            # Initial fill of an empty table: build secondary indexes once after the insert instead of
+            # updating them row by row. Nothing can conflict with existing rows, so only de-duplicate
+            # the batch itself (last rating wins, matching INSERT OR REPLACE).
+            df_ratings_load = df_ratings_load.drop_duplicates(subset=['user_id', 'movie_id'], keep='last')
+            index_statements = drop_secondary_indexes('ratings', conn)
+
+        if not df_ratings_load.empty:
+            conn.exec_driver_sql(
+                'INSERT OR REPLACE INTO ratings (user_id, movie_id, rating, timestamp) VALUES (?, ?, ?, ?)',
+                list(df_ratings_load.itertuples(index=False, name=None))
+            )
+        for statement in index_statements:
+            conn.exec_driver_sql(statement)
+        print(f"  > Inserted {len(df_ratings_load)} new ratings.")
+
+    engine.dispose()  # Release the exclusive lock held by the pooled connection
 
     print("--- ETL Pipeline Completed Successfully! ---")
 
@@ -225,4 +451,6 @@ if __name__ == '__main__':
     if not OMDB_API_KEY or OMDB_API_KEY == 'YOUR_OMDB_API_KEY':
         print("!!! ERROR: Please set a valid OMDb API key in your .env file !!!")
     else:
+        # Turn SIGTERM into SystemExit so enrichment can flush the OMDb cache before exiting
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
         etl_pipeline()
@@ -1,10 +1,11 @@
 -- queries.sql
+-- Note: ratings.rating is stored as half-stars (stars * 2), so averages are divided by 2.0.
 
 -- 1. Which movie has the highest average rating?
 -- We use a HAVING clause to filter out movies with too few ratings, improving relevance.
 SELECT
     m.title,
-    ROUND(AVG(r.rating), 1) AS average_rating,
+    ROUND(AVG(r.rating) / 2.0, 1) AS average_rating,
     COUNT(r.rating) AS rating_count
 FROM movies AS m
 JOIN ratings AS r ON m.movie_id = r.movie_id
@@ -18,7 +19,7 @@ LIMIT 1;
 -- 2. What are the top 5 movie genres that have the highest average rating?
 SELECT
     g.genre_name,
-    ROUND(AVG(r.rating), 1) AS average_rating,
+    ROUND(AVG(r.rating) / 2.0, 1) AS average_rating,
     COUNT(r.rating) AS total_ratings
 FROM genres AS g
 JOIN movie_genres AS mg ON g.genre_id = mg.genre_id
@@ -45,7 +46,7 @@ LIMIT 1;
 -- 4. What is the average rating of movies released each year?
 SELECT
     release_year,
-    ROUND(AVG(r.rating), 1) AS average_rating,
+    ROUND(AVG(r.rating) / 2.0, 1) AS average_rating,
     COUNT(DISTINCT m.movie_id) AS movie_count,
     COUNT(r.rating) AS total_ratings
 FROM movies AS m
@@ -10,7 +10,7 @@ CREATE TABLE IF NOT EXISTS movies (
     plot TEXT,
     box_office TEXT,  -- Storing Box Office as a clean numerical value
     poster_url TEXT,
-    runtime_minutes TEXT,
+    runtime_minutes INTEGER,
     metascore INTEGER,
     imdb_rating REAL
 );
@@ -35,7 +35,10 @@ CREATE TABLE IF NOT EXISTS ratings (
     rating_id INTEGER PRIMARY KEY AUTOINCREMENT,
     user_id INTEGER NOT NULL,
     movie_id INTEGER NOT NULL,
-    rating REAL NOT NULL,
+    rating INTEGER NOT NULL,  -- Half-stars: stored rating = stars * 2 (e.g. 4.5 -> 9)
     timestamp INTEGER NOT NULL,
     FOREIGN KEY (movie_id) REFERENCES movies (movie_id)
-);
\ No newline at end of file
+);
+
+-- Natural key for ratings: one rating per user per movie (enables incremental upserts)
+CREATE UNIQUE INDEX IF NOT EXISTS idx_ratings_user_movie ON ratings (user_id, movie_id);
@@ -5,8 +5,14 @@ import re
 db_path = "movie_analytics.db"
 sql_file_path = "queries.sql"
 
-# Connect to SQLite
-conn = sqlite3.connect(db_path)
+# Comment (-- ...) and separator (---) patterns, compiled once
+comment_re = re.compile(r'--.*')
+separator_re = re.compile(r'-{3,}')
+
+# Connect to SQLite (autocommit mode: transactions are opened explicitly below)
+conn = sqlite3.connect(db_path, isolation_level=None)
+conn.execute('PRAGMA journal_mode=WAL')
+conn.execute('PRAGMA synchronous=NORMAL')
 cursor = conn.cursor()
 
 # Read SQL file
@@ -14,18 +20,45 @@ with open(sql_file_path, 'r', encoding='utf-8') as file:
     sql_content = file.read()
 
 # Remove comments (lines starting with --)
-sql_content = re.sub(r'--.*', '', sql_content)
+sql_content = comment_re.sub('', sql_content)
 
 # Remove extra separator lines (like ---)
-sql_content = re.sub(r'-{3,}', '', sql_content)
+sql_content = separator_re.sub('', sql_content)
 
 # Split queries by semicolon, clean them up
 queries = [q.strip() for q in sql_content.split(';') if q.strip()]
 
 print(f"Found {len(queries)} queries to execute.\n")
 
-# Execute queries one by one
+# Consecutive non-SELECT statements are buffered and run as one script in a single transaction
+pending_statements = []
+
+
+def run_pending_statements():
+    """Execute buffered non-SELECT statements with one executescript call and one commit."""
+    if not pending_statements:
+        return
+    numbers = ', '.join(str(i) for i, _ in pending_statements)
+    label = 'Query' if len(pending_statements) == 1 else 'Queries'
+    try:
+        print(f"Executing {label} {numbers} (non-select batch)...")
+        cursor.executescript('BEGIN;\n' + ';\n'.join(q for _, q in pending_statements) + ';\nCOMMIT;')
+        print("Queries executed successfully (non-select).")
+    except Exception as e:
+        if conn.in_transaction:
+            conn.execute('ROLLBACK')
+        print(f"Error executing {label.lower()} {numbers}: {e}")
+    print("\n" + "-" * 80 + "\n")
+    pending_statements.clear()
+
+
+# Execute queries in file order
 for i, query in enumerate(queries, start=1):
+    if not query.lower().startswith('select'):
+        pending_statements.append((i, query))
+        continue
+
+    run_pending_statements()
     try:
         print(f"Executing Query {i}:")
         print(query[:150] + ('...' if len(query) > 150 else ''))
@@ -33,19 +66,16 @@ for i, query in enumerate(queries, start=1):
         cursor.execute(query)
         results = cursor.fetchall()
 
-        if query.lower().startswith('select'):
-            print("Result:")
-            for row in results:
-                print(row)
-        else:
-            conn.commit()
-            print("Query executed successfully (non-select).")
+        print("Result:")
+        for row in results:
+            print(row)
 
         print("\n" + "-" * 80 + "\n")
 
     except Exception as e:
         print(f"Error executing query {i}: {e}\n")
 
+run_pending_statements()
 conn.close()
 print("All queries executed successfully!")
 